@@ -1,9 +1,16 @@
 import numpy as np
 import pandas as pd
 import json
+from functools import lru_cache
 from niapy.problems import Problem
-from niaarmts.rule import build_rule
-from niaarmts.metrics import calculate_support, calculate_confidence, calculate_inclusion_metric, calculate_amplitude_metric, calculate_fitness
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard json module is used without it
+    orjson = None
+from niaarmts.rule import build_rule_array, rule_to_attributes, feature_metadata, feature_table
+from niaarmts.cache import TransactionCache
+from niaarmts.metrics import bind_features, rule_conditions_key, calculate_support_confidence_by_key, calculate_inclusion_metric, calculate_amplitude_metric, calculate_fitness
 
 class NiaARMTS(Problem):
     def __init__(
@@ -17,7 +24,8 @@ class NiaARMTS(Problem):
         alpha,
         beta,
         gamma,
-        delta
+        delta,
+        min_support=0.0
     ):
         """
         Initialize instance of NiaARMTS.
@@ -33,6 +41,7 @@ class NiaARMTS(Problem):
             beta (float): Weight for confidence in fitness function.
             gamma (float): Weight for inclusion in fitness function.
             delta (float): Weight for amplitude in fitness function.
+            min_support (float): Optional, rules with a lower support are rejected with a fitness of 0.
 
         Raises:
             KeyError: Timestamp column is required when interval is set to false.
@@ -42,22 +51,73 @@ class NiaARMTS(Problem):
 
         self.dim = dimension
         self.features = features
+        self.feature_meta = feature_metadata(features)  # Feature metadata indexed by feature position
+        self.feature_table = feature_table(self.feature_meta)  # Flattened feature metadata used to decode rules
         self.transactions = transactions
+        # NumPy column arrays used by the metrics, sorted by the column used for time-based filtering
+        self.transaction_cache = TransactionCache(transactions, 'interval' if interval == 'true' else 'timestamp')
+        self.feature_bindings = bind_features(self.transaction_cache, features)
+
+        # PSO decodes many particles to identical rules, so support and confidence are memoized by rule key
+        self.support_confidence = lru_cache(maxsize=65536)(self._support_confidence)
         self.interval = interval  # 'true' if we deal with interval data, 'false' if we deal with pure time series data
         self.alpha = alpha
         self.beta = beta
         self.gamma = gamma
         self.delta = delta
+        self.min_support = min_support
 
         # Archive for storing all unique rules with fitness > 0.0
         self.rule_archive = []
 
+        # Evaluations computed ahead of time (e.g. by worker processes), keyed by solution bytes
+        self.pending_evaluations = {}
+
         # Store the best fitness value
         self.best_fitness = np.NINF
         super().__init__(dimension, lower, upper)
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # LRU cache wrappers can not be pickled, the cache is rebuilt empty
+        del state['support_confidence']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.support_confidence = lru_cache(maxsize=65536)(self._support_confidence)
+
     # NiaPy evaluation function
     def _evaluate(self, solution):
+        evaluation = self.pending_evaluations.pop(solution.tobytes(), None)
+        if evaluation is None:
+            evaluation = self.evaluate_rule(solution)
+
+        # Store the rule if it has fitness > 0 and it's unique, converting it to attribute dictionaries
+        fitness = evaluation['fitness']
+        if fitness > 0:
+            self.add_rule_to_archive(
+                rule_to_attributes(evaluation['full_rule'], self.feature_meta),
+                rule_to_attributes(evaluation['antecedent'], self.feature_meta),
+                rule_to_attributes(evaluation['consequent'], self.feature_meta),
+                fitness,
+                evaluation['start'], evaluation['end'], evaluation['support'], evaluation['confidence'],
+                evaluation['inclusion'], evaluation['amplitude']
+            )
+
+        return fitness
+
+    def evaluate_rule(self, solution):
+        """
+        Decode a solution into a rule and calculate its metrics, without storing it in the archive.
+
+        Args:
+            solution (np.ndarray): The solution to evaluate.
+
+        Returns:
+            dict: The fitness of the rule and, if the rule has both antecedents and consequents, the rule,
+            its antecedent and consequent (as rule arrays), time range, support, confidence, inclusion and amplitude.
+        """
         # get cut point
         cut_point_val = solution[-1]
         solution = np.delete(solution, -1)
@@ -84,7 +144,7 @@ class NiaARMTS(Problem):
             end = self.transactions['timestamp'].iloc[max_interval]
 
         # Step 1: Build the rules using the solution and features
-        rule = build_rule(solution, self.features, is_time_series=(self.interval == "false"))
+        rule = build_rule_array(solution, self.feature_table)
 
         # Step 2: Split the rule into antecedents and consequents based on the cut point
         cut = self.cut_point(cut_point_val, len(rule))
@@ -95,32 +155,52 @@ class NiaARMTS(Problem):
         if len(antecedent) > 0 and len(consequent) > 0:
             # Calculate support and confidence always
 
-            if self.interval != "true":
-                support = calculate_support(self.transactions, antecedent, consequent, start, end)
-                confidence = calculate_confidence(self.transactions, antecedent, consequent, start, end)
+            support, confidence = self.support_confidence(
+                rule_conditions_key(self.feature_bindings, antecedent),
+                rule_conditions_key(self.feature_bindings, consequent),
+                start,
+                end,
+                self.min_support
+            )
 
-            else:
-                support = calculate_support(self.transactions, antecedent, consequent, start, end, use_interval=True)
-                confidence = calculate_confidence(self.transactions, antecedent, consequent, start, end, use_interval=True)
+            # Rules below the support floor are rejected without computing the remaining metrics
+            if support < self.min_support:
+                return {'fitness': 0.0}
 
             inclusion = 0.0
             if self.gamma > 0.0:
-                inclusion = calculate_inclusion_metric(self.features, antecedent, consequent)
+                inclusion = calculate_inclusion_metric(self.feature_table, antecedent, consequent)
 
             amplitude = 0.0
             if self.delta > 0.0:
-                amplitude = calculate_amplitude_metric(self.features, antecedent, consequent)
+                amplitude = calculate_amplitude_metric(self.feature_table, antecedent, consequent)
 
             # Step 4: Calculate the fitness of the rules using weights for support, confidence, inclusion and amplitude
             fitness = calculate_fitness(support, confidence, inclusion, amplitude)
 
-            # Step 5: Store the rule if it has fitness > 0 and it's unique
-            if fitness > 0:
-                self.add_rule_to_archive(rule, antecedent, consequent, fitness, start, end, support, confidence, inclusion, amplitude)
-
-            return fitness
+            return {
+                'full_rule': rule,
+                'antecedent': antecedent,
+                'consequent': consequent,
+                'fitness': fitness,
+                'support': support,
+                'confidence': confidence,
+                'inclusion': inclusion,
+                'amplitude': amplitude,
+                'start': start,
+                'end': end
+            }
         else:
-            return 0.0
+            return {'fitness': 0.0}
+
+    def _support_confidence(self, antecedent_key, consequent_key, start, end, min_support=0.0):
+        """
+        Calculate support and confidence of a rule given by its antecedent and consequent keys.
+        Wrapped with an LRU cache in the constructor, so every argument is part of the cache key.
+        """
+        return calculate_support_confidence_by_key(
+            self.transaction_cache, antecedent_key, consequent_key, start, end, min_support
+        )
 
     def add_rule_to_archive(self, full_rule, antecedent, consequent, fitness, start, end, support, confidence, inclusion, amplitude):
         """
@@ -218,43 +298,38 @@ class NiaARMTS(Problem):
             file_path (str): The path to save the CSV file.
         """
         # Ensure archive is sorted by fitness
-        self.get_rule_archive()
-
-        # Prepare data for the CSV
-        rule_data = []
-        for entry in self.rule_archive:
-            rule_info = {
-                'fitness': entry['fitness'],
-                'support': entry['support'],
-                'confidence': entry['confidence'],
-                'inclusion': entry['inclusion'],
-                'amplitude': entry['amplitude'],
-                'antecedent': str(entry['antecedent']),
-                'consequent': str(entry['consequent']),
-                'start_timestamp': entry['start'],
-                'end_timestamp': entry['end']
-            }
-            rule_data.append(rule_info)
-
-        # Create a DataFrame and save to CSV
-        df = pd.DataFrame(rule_data)
+        archive = self.get_rule_archive()
+
+        # Prepare data for the CSV column by column and save it with a single write
+        df = pd.DataFrame({
+            'fitness': [entry['fitness'] for entry in archive],
+            'support': [entry['support'] for entry in archive],
+            'confidence': [entry['confidence'] for entry in archive],
+            'inclusion': [entry['inclusion'] for entry in archive],
+            'amplitude': [entry['amplitude'] for entry in archive],
+            'antecedent': [str(entry['antecedent']) for entry in archive],
+            'consequent': [str(entry['consequent']) for entry in archive],
+            'start_timestamp': [entry['start'] for entry in archive],
+            'end_timestamp': [entry['end'] for entry in archive]
+        })
         df.to_csv(file_path, index=False)
         print(f"Rules saved to {file_path}.")
 
     def save_rules_to_json(self, file_path):
         """
         Save the archived rules to a JSON file, sorted by fitness (descending).
+        Uses orjson if it is installed, otherwise the standard json module. The content is the same, but
+        orjson indents the file by 2 spaces and the json module by 4 spaces.
 
         Args:
             file_path (str): The path to save the JSON file.
         """
         # Ensure archive is sorted by fitness
-        self.get_rule_archive()
+        archive = self.get_rule_archive()
 
         # Prepare the archive as a JSON-friendly format
-        archive_dict = {'rules': []}
-        for entry in self.rule_archive:
-            archive_dict['rules'].append({
+        archive_dict = {'rules': [
+            {
                 'fitness': entry['fitness'],
                 'support': entry['support'],
                 'confidence': entry['confidence'],
@@ -264,9 +339,15 @@ class NiaARMTS(Problem):
                 'consequent': entry['consequent'],
                 'start_timestamp': str(entry['start']),
                 'end_timestamp': str(entry['end'])
-            })
+            }
+            for entry in archive
+        ]}
 
         # Save to JSON
-        with open(file_path, 'w') as f:
-            json.dump(archive_dict, f, indent=4)
+        if orjson is not None:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(archive_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str))
+        else:
+            with open(file_path, 'w') as f:
+                json.dump(archive_dict, f, indent=4)
         print(f"Rules saved to {file_path}.")
@@ -1,9 +1,11 @@
 from niaarmts.dataset import Dataset
 from niaarmts.feature import Feature
+from niaarmts.cache import TransactionCache
 from niaarmts.rule import build_rule
 from niaarmts.NiaARMTS import NiaARMTS
-from niaarmts.metrics import calculate_support, calculate_confidence, calculate_inclusion_metric, calculate_amplitude_metric, calculate_fitness
+from niaarmts.parallel import ParallelParticleSwarmAlgorithm
+from niaarmts.metrics import calculate_support, calculate_confidence, calculate_support_confidence, calculate_inclusion_metric, calculate_amplitude_metric, calculate_fitness
 
-__all__ = ["Dataset", "Feature", "build_rule", "NiaARMTS", "calculate_support", "calculate_confidence", "calculate_inclusion_metric", "calculate_amplitude_metric", "calculate_fitness"]
+__all__ = ["Dataset", "Feature", "TransactionCache", "build_rule", "NiaARMTS", "ParallelParticleSwarmAlgorithm", "calculate_support", "calculate_confidence", "calculate_support_confidence", "calculate_inclusion_metric", "calculate_amplitude_metric", "calculate_fitness"]
 
 __version__ = "0.1.3"
@@ -0,0 +1,139 @@
+import pandas as pd
+import numpy as np
+
+class TransactionCache:
+    def __init__(self, data: pd.DataFrame, time_col: str = None, dtype=np.float64):
+        """
+        Initializes the TransactionCache class.
+
+        Every column of the transaction data frame is extracted once as a raw NumPy array, so that
+        metric calculations can combine boolean masks instead of re-slicing the data frame.
+        Numerical features are stacked into one contiguous matrix and categorical features, factorized
+        into small integer codes, into another, with one row per feature. Matching a category is thus
+        an integer comparison instead of an element-wise comparison of Python strings. Numerical
+        features are stored as float64 by default. float32 halves the memory traffic of range filters,
+        but values and borders which differ only beyond float32 precision then compare as equal, which
+        changes support and confidence, so it has to be requested explicitly.
+        All columns are sorted by the time column, so that a time range maps to a contiguous slice
+        of rows which is found with a binary search.
+
+        :param data: A Pandas DataFrame containing all transactions.
+        :param time_col: Optional, the column used for time-based filtering ('interval' or 'timestamp').
+                         Defaults to 'interval' if present, otherwise 'timestamp'.
+        :param dtype: Optional, the data type of the numerical feature matrix (np.float64 or np.float32).
+        """
+        if time_col is None:
+            time_col = 'interval' if 'interval' in data.columns else 'timestamp'
+
+        self.length = len(data)
+        self.time_col = time_col if time_col in data.columns else None
+        self.columns = {}
+        self.category_codes = {}
+        self.numerical_index = {}
+        self.categorical_index = {}
+
+        # Transactions are usually already in time order, in which case no reordering is needed
+        order = None
+        if self.time_col is not None:
+            time_key = data[self.time_col].to_numpy()
+            if not np.all(time_key[:-1] <= time_key[1:]):
+                order = np.argsort(time_key, kind='stable')
+
+        numerical = []
+        categorical = []
+        for column in data.columns:
+            col_data = data[column]
+            if column == 'timestamp' or column == 'interval':
+                values = col_data.to_numpy()
+            elif np.issubdtype(col_data.dtype, np.number):
+                self.numerical_index[column] = len(numerical)
+                values = col_data.to_numpy(dtype=dtype)
+                numerical.append(column)
+            elif col_data.dtype == 'object':
+                # Missing values get a code of their own, which no category maps to
+                codes, categories = pd.factorize(col_data, use_na_sentinel=False)
+                self.category_codes[column] = {
+                    category: code for code, category in enumerate(categories) if not pd.isna(category)
+                }
+                self.categorical_index[column] = len(categorical)
+                values = codes.astype(np.min_scalar_type(-max(len(categories), 1)))
+                categorical.append(column)
+            else:
+                values = col_data.to_numpy()
+
+            self.columns[column] = values if order is None else values[order]
+
+        self.numerical = self._stack([self.columns[column] for column in numerical], dtype)
+        self.categorical = self._stack([self.columns[column] for column in categorical], np.int8)
+
+        # Expose the feature columns as views of the matrices
+        for column, idx in self.numerical_index.items():
+            self.columns[column] = self.numerical[idx]
+        for column, idx in self.categorical_index.items():
+            self.columns[column] = self.categorical[idx]
+
+    def _stack(self, columns, default_dtype):
+        """
+        Stack columns into a C-contiguous matrix with one row per column.
+
+        :param columns: A list of NumPy arrays of equal length.
+        :param default_dtype: The data type used when there are no columns.
+        :return: A 2D NumPy array.
+        """
+        if not columns:
+            return np.empty((0, self.length), dtype=default_dtype)
+        return np.ascontiguousarray(np.vstack(columns).astype(np.result_type(*columns), copy=False))
+
+    def get_column(self, column: str):
+        """
+        Get the cached NumPy array of a given column.
+
+        :param column: The name of the column.
+        :return: A NumPy array with the column values (integer codes for categorical columns).
+        """
+        return self.columns[column]
+
+    def get_time_window(self, start, end):
+        """
+        Find the contiguous slice of (time sorted) rows inside the given time range.
+
+        :param start: The start of the range (inclusive).
+        :param end: The end of the range (inclusive).
+        :return: A slice over the cached columns.
+        """
+        if self.time_col is None:
+            raise KeyError('Transactions do not contain a time column.')
+
+        time_key = self.columns[self.time_col]
+        if time_key.dtype.kind == 'M':
+            start = pd.Timestamp(start).to_datetime64()
+            end = pd.Timestamp(end).to_datetime64()
+
+        low = int(np.searchsorted(time_key, start, side='left'))
+        high = int(np.searchsorted(time_key, end, side='right'))
+        return slice(low, max(low, high))
+
+    def get_category_code(self, column: str, category):
+        """
+        Get the integer code of a category in a categorical column.
+
+        :param column: The name of the categorical column.
+        :param category: The category to look up.
+        :return: The integer code, or None if the category does not occur in the column.
+        """
+        return self.category_codes[column].get(category)
+
+
+def as_transaction_cache(transactions, time_col: str = None):
+    """
+    Wrap transactions into a TransactionCache, unless they are already cached.
+
+    :param transactions: A Pandas DataFrame or a TransactionCache.
+    :param time_col: Optional, the column used for time-based filtering.
+    :return: A TransactionCache over the given transactions.
+    """
+    if isinstance(transactions, TransactionCache):
+        if time_col is not None and transactions.time_col != time_col:
+            raise ValueError(f"Transactions are cached by '{transactions.time_col}', not by '{time_col}'.")
+        return transactions
+    return TransactionCache(transactions, time_col)
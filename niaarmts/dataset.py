@@ -10,15 +10,23 @@ class Dataset:
         self.data = pd.DataFrame()
         self.timestamp_col = None
         self.feature_analysis = None
+        self.features_metadata = None
+        self._features_source = None
 
-    def load_data_from_csv(self, file_path: str, timestamp_col: str = None):
+    def load_data_from_csv(self, file_path: str, timestamp_col: str = None, engine: str = None):
         """
         Load the dataset from a CSV file.
 
         :param file_path: Path to the CSV file.
         :param timestamp_col: Optional, the name of the column containing timestamps (if applicable).
+        :param engine: Optional, the Pandas CSV parser engine. Defaults to the Pandas default parser.
+                       'pyarrow' (requires pyarrow) is considerably faster on large files, but it parses
+                       ISO-8601 date strings into datetimes, so such columns are no longer categorical features.
         """
-        self.data = pd.read_csv(file_path)
+        if engine is not None:
+            self.data = pd.read_csv(file_path, engine=engine)
+        else:
+            self.data = pd.read_csv(file_path)
 
         if timestamp_col:
             self.timestamp_col = timestamp_col
@@ -30,6 +38,7 @@ class Dataset:
 
         # Initialize FeatureAnalysis after data loading
         self.feature_analysis = Feature(self.data)
+        self.features_metadata = None
 
     def get_feature_summary(self):
         """
@@ -121,6 +130,15 @@ class Dataset:
         if self.feature_analysis is None:
             raise ValueError("Data has not been loaded yet.")
 
+        # Metadata is computed once per data frame, and recomputed if the data is replaced
+        if self.features_metadata is None or self._features_source is not self.data:
+            self.features_metadata = self._compute_features_metadata()
+            self._features_source = self.data
+
+        # Callers get their own copies, so that changing them does not affect later calls
+        return {column: dict(metadata) for column, metadata in self.features_metadata.items()}
+
+    def _compute_features_metadata(self):
         # Prepare feature metadata
         features_metadata = {}
 
@@ -0,0 +1,276 @@
+import math
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, the NumPy implementation is used without it
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+# Feature types in the feature descriptor table and in rule arrays
+NUMERICAL = 0
+CATEGORICAL = 1
+UNKNOWN = 2
+
+# Rule borders are rounded to 4 decimals, so scaling them by 10^4 gives exact integer keys
+BORDER_SCALE = 10 ** 4
+
+# Narrowing row indices one condition at a time stops beating the vectorized NumPy masks at about
+# 16k rows (with broad conditions), so larger windows are always counted with NumPy
+NUMBA_MAX_ROWS = 1 << 14
+
+
+def count_matches(numerical, categorical, window, antecedents, consequents, min_count=0):
+    """
+    Count the rows inside a time window that match the antecedents, and those that match both the
+    antecedents and the consequents.
+
+    Windows of up to NUMBA_MAX_ROWS rows are counted by a compiled kernel when Numba is available,
+    larger ones with vectorized NumPy masks.
+
+    If min_count is given, counting stops as soon as fewer than min_count rows can match both the
+    antecedents and the consequents, and both counts are returned as 0.
+
+    Conditions are given in compiled form (see metrics.compile_conditions), as a tuple of arrays
+    (numerical rows, lower borders, upper borders, categorical rows, category codes).
+
+    Args:
+        numerical (np.ndarray): Matrix of numerical features, one row per feature.
+        categorical (np.ndarray): Matrix of categorical feature codes, one row per feature.
+        window (slice): The contiguous slice of rows inside the time range.
+        antecedents (tuple): The compiled antecedent conditions.
+        consequents (tuple): The compiled consequent conditions.
+        min_count (int): Optional, the minimum number of rows matching both, below which counting stops.
+
+    Returns:
+        tuple[int, int]: The antecedent count and the antecedent and consequent count.
+    """
+    if NUMBA_AVAILABLE and window.stop - window.start <= NUMBA_MAX_ROWS:
+        return _count_matches_numba(numerical, categorical, window.start, window.stop, min_count,
+                                    *antecedents, *consequents)
+    return _count_matches_numpy(numerical, categorical, window, antecedents, consequents, min_count)
+
+
+def decode_rule(solution, types, minimums, maximums, n_categories, vector_positions, threshold_positions):
+    """
+    Decode a solution into the attributes of a rule, using a flattened feature descriptor table.
+
+    Features are visited in descending order of the permutation part of the solution (ties in reverse
+    feature order). A feature is part of the rule if its vector value exceeds its threshold value.
+
+    Args:
+        solution (np.ndarray): The solution (float64), without the time and cut point values.
+        types (np.ndarray): NUMERICAL, CATEGORICAL or UNKNOWN, per feature (only CATEGORICAL is decoded differently).
+        minimums (np.ndarray): Minimum values of numerical features.
+        maximums (np.ndarray): Maximum values of numerical features.
+        n_categories (np.ndarray): Numbers of categories of categorical features.
+        vector_positions (np.ndarray): Positions of the feature vectors in the solution.
+        threshold_positions (np.ndarray): Positions of the feature thresholds in the solution.
+
+    Returns:
+        tuple: Arrays with the feature index, both borders (rounded to 4 decimals) and the selected
+        category index (-1 for numerical features) of every attribute, in rule order.
+    """
+    if NUMBA_AVAILABLE:
+        return _decode_rule(solution, types, minimums, maximums, n_categories, vector_positions, threshold_positions)
+    return _decode_rule_python(solution, types, minimums, maximums, n_categories, vector_positions, threshold_positions)
+
+
+def _decode_rule_python(solution, types, minimums, maximums, n_categories, vector_positions, threshold_positions):
+    # Without Numba, the decoding runs on Python lists and floats, which avoids NumPy's per-call overhead
+    # on such short arrays
+    num_features = len(types)
+    solution = solution.tolist()
+    permutation = solution[len(solution) - num_features:]
+    # Stable ascending sort, reversed, so that ties are in reverse feature order like in the Numba kernel
+    order = sorted(range(num_features), key=permutation.__getitem__)[::-1]
+
+    types = types.tolist()
+    minimums = minimums.tolist()
+    maximums = maximums.tolist()
+    n_categories = n_categories.tolist()
+    vector_positions = vector_positions.tolist()
+    threshold_positions = threshold_positions.tolist()
+
+    features = []
+    border1 = []
+    border2 = []
+    categories = []
+
+    for i in order:
+        vector_position = vector_positions[i]
+        if solution[vector_position] > solution[threshold_positions[i]]:
+            features.append(i)
+            if types[i] == CATEGORICAL:
+                border1.append(1.0)
+                border2.append(1.0)
+                categories.append(int(solution[vector_position] * (n_categories[i] - 1)))
+            else:
+                value_range = maximums[i] - minimums[i]
+                low = _round_border(minimums[i] + value_range * solution[vector_position])
+                high = _round_border(minimums[i] + value_range * solution[vector_position + 1])
+                if low > high:
+                    low, high = high, low
+                border1.append(low)
+                border2.append(high)
+                categories.append(-1)
+
+    return (
+        np.array(features, dtype=np.int64),
+        np.array(border1, dtype=np.float64),
+        np.array(border2, dtype=np.float64),
+        np.array(categories, dtype=np.int64)
+    )
+
+
+def _round_border(value):
+    # Same result as np.round(value, 4): round() is also half to even, and returns an exact integer for
+    # values of any magnitude. Non-finite values, which round() rejects, are kept like np.round does
+    scaled = value * BORDER_SCALE
+    if not math.isfinite(scaled):
+        return scaled / BORDER_SCALE
+    return round(scaled) / BORDER_SCALE
+
+
+def _decode_rule(solution, types, minimums, maximums, n_categories, vector_positions, threshold_positions):
+    num_features = types.shape[0]
+    order = np.argsort(solution[solution.shape[0] - num_features:], kind='mergesort')[::-1]
+
+    features = np.empty(num_features, dtype=np.int64)
+    border1 = np.empty(num_features, dtype=np.float64)
+    border2 = np.empty(num_features, dtype=np.float64)
+    categories = np.empty(num_features, dtype=np.int64)
+
+    count = 0
+    for i in order:
+        vector_position = vector_positions[i]
+        if solution[vector_position] > solution[threshold_positions[i]]:
+            features[count] = i
+            if types[i] == CATEGORICAL:
+                border1[count] = 1.0
+                border2[count] = 1.0
+                categories[count] = int(solution[vector_position] * (n_categories[i] - 1))
+            else:
+                # Same rounding as np.round(value, 4)
+                value_range = maximums[i] - minimums[i]
+                low = np.rint((minimums[i] + value_range * solution[vector_position]) * BORDER_SCALE) / BORDER_SCALE
+                high = np.rint((minimums[i] + value_range * solution[vector_position + 1]) * BORDER_SCALE) / BORDER_SCALE
+                if low > high:
+                    low, high = high, low
+                border1[count] = low
+                border2[count] = high
+                categories[count] = -1
+            count += 1
+
+    return features[:count], border1[:count], border2[:count], categories[:count]
+
+
+def _popcount(words):
+    """
+    Count the set bits of a packed mask.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum())
+    return int(_POPCOUNT_TABLE[words.view(np.uint8)].sum())
+
+
+# Number of set bits of every byte, used when np.bitwise_count is not available (NumPy < 2.0)
+_POPCOUNT_TABLE = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+
+def _narrow_mask(mask, scratch, min_count, numerical, categorical, window,
+                 num_rows, num_low, num_high, cat_rows, cat_codes):
+    # Every condition is written into the scratch buffer and packed into 64 rows per word,
+    # so the mask is narrowed with one AND per 64 rows
+    # Returns False as soon as fewer than min_count rows match, as further conditions only narrow the mask
+    condition = scratch[:window.stop - window.start]
+    for k in range(len(num_rows)):
+        column = numerical[num_rows[k], window]
+        np.greater_equal(column, num_low[k], out=condition)
+        mask &= np.packbits(scratch).view(np.uint64)
+        np.less_equal(column, num_high[k], out=condition)
+        mask &= np.packbits(scratch).view(np.uint64)
+        if min_count > 0 and _popcount(mask) < min_count:
+            return False
+    for k in range(len(cat_rows)):
+        np.equal(categorical[cat_rows[k], window], cat_codes[k], out=condition)
+        mask &= np.packbits(scratch).view(np.uint64)
+        if min_count > 0 and _popcount(mask) < min_count:
+            return False
+    return True
+
+
+def _count_matches_numpy(numerical, categorical, window, antecedents, consequents, min_count=0):
+    n_rows = window.stop - window.start
+    if n_rows < min_count:
+        return 0, 0
+
+    # Rows are padded to a multiple of 64 with rows that never match
+    scratch = np.zeros(-(-n_rows // 64) * 64, dtype=bool)
+    scratch[:n_rows] = True
+    mask = np.packbits(scratch).view(np.uint64)
+
+    if not _narrow_mask(mask, scratch, min_count, numerical, categorical, window, *antecedents):
+        return 0, 0
+    antecedent_count = _popcount(mask)
+
+    if not _narrow_mask(mask, scratch, min_count, numerical, categorical, window, *consequents):
+        return 0, 0
+    consequent_count = _popcount(mask)
+    if consequent_count < min_count:
+        return 0, 0
+
+    return antecedent_count, consequent_count
+
+
+if NUMBA_AVAILABLE:
+    _decode_rule = njit(cache=True)(_decode_rule)
+
+    @njit(cache=True)
+    def _narrow_indices(rows, count, min_count, numerical, categorical,
+                        num_rows, num_low, num_high, cat_rows, cat_codes):
+        # One condition at a time, the indices of the matching rows are compacted in place without branches
+        for k in range(num_rows.shape[0]):
+            column = numerical[num_rows[k]]
+            low = num_low[k]
+            high = num_high[k]
+            kept = 0
+            for j in range(count):
+                row = rows[j]
+                value = column[row]
+                rows[kept] = row
+                # Missing (NaN) values fail both comparisons, so they never match
+                kept += (value >= low) & (value <= high)
+            count = kept
+            if count < min_count:
+                return count
+        for k in range(cat_rows.shape[0]):
+            column = categorical[cat_rows[k]]
+            code = cat_codes[k]
+            kept = 0
+            for j in range(count):
+                row = rows[j]
+                rows[kept] = row
+                kept += column[row] == code
+            count = kept
+            if count < min_count:
+                return count
+        return count
+
+    @njit(cache=True)
+    def _count_matches_numba(numerical, categorical, low, high, min_count,
+                             ant_num_rows, ant_num_low, ant_num_high, ant_cat_rows, ant_cat_codes,
+                             con_num_rows, con_num_low, con_num_high, con_cat_rows, con_cat_codes):
+        rows = np.arange(low, high)
+
+        antecedent_count = _narrow_indices(rows, high - low, min_count, numerical, categorical,
+                                           ant_num_rows, ant_num_low, ant_num_high, ant_cat_rows, ant_cat_codes)
+        if antecedent_count < min_count:
+            return 0, 0
+
+        consequent_count = _narrow_indices(rows, antecedent_count, min_count, numerical, categorical,
+                                           con_num_rows, con_num_low, con_num_high, con_cat_rows, con_cat_codes)
+        if consequent_count < min_count:
+            return 0, 0
+        return antecedent_count, consequent_count
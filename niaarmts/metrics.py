@@ -1,12 +1,16 @@
 import pandas as pd
 import numpy as np
+from niaarmts.cache import TransactionCache, as_transaction_cache
+from niaarmts.kernels import NUMERICAL, CATEGORICAL, BORDER_SCALE, count_matches
+from niaarmts.rule import FeatureTable
+
 
 def calculate_support(df, antecedents, consequents, start=0, end=0, use_interval=False):
     """
     Calculate the support for the given list of antecedents and consequents within the specified time range or interval range.
 
     Args:
-        df (pd.DataFrame): The dataset containing the transactions.
+        df (pd.DataFrame or TransactionCache): The dataset containing the transactions.
         antecedents (list): A list of dictionaries defining the antecedent conditions.
         consequents (list): A list of dictionaries defining the consequent conditions.
         start (int or datetime): The start of the interval (if use_interval is True) or timestamp range.
@@ -17,35 +21,7 @@ def calculate_support(df, antecedents, consequents, start=0, end=0, use_interval
         float: The support value, which is the ratio of transactions matching both antecedents and consequents
         to the total transactions in the filtered range. If no transactions exist, returns 0.
     """
-    if use_interval:
-        df_filtered = df[(df['interval'] >= start) & (df['interval'] <= end)]
-    else:
-        df_filtered = df[(df['timestamp'] >= start) & (df['timestamp'] <= end)]
-
-    filtered = len(df_filtered)
-
-    # Apply each antecedent condition
-    for antecedent in antecedents:
-        if antecedent['type'] == 'Categorical':
-            df_filtered = df_filtered[df_filtered[antecedent['feature']] == antecedent['category']]
-        elif antecedent['type'] == 'Numerical':
-            df_filtered = df_filtered[
-                (df_filtered[antecedent['feature']] >= antecedent['border1']) &
-                (df_filtered[antecedent['feature']] <= antecedent['border2'])
-            ]
-
-    # Apply each consequent condition
-    for consequent in consequents:
-        if consequent['type'] == 'Categorical':
-            df_filtered = df_filtered[df_filtered[consequent['feature']] == consequent['category']]
-        elif consequent['type'] == 'Numerical':
-            df_filtered = df_filtered[
-                (df_filtered[consequent['feature']] >= consequent['border1']) &
-                (df_filtered[consequent['feature']] <= consequent['border2'])
-            ]
-
-    # Calculate support: the ratio of rows matching both antecedents and consequents to total filtered rows
-    return len(df_filtered) / filtered if len(df) > 0 else 0
+    return calculate_support_confidence(df, antecedents, consequents, start, end, use_interval)[0]
 
 
 def calculate_confidence(df, antecedents, consequents, start, end, use_interval=False):
@@ -53,7 +29,7 @@ def calculate_confidence(df, antecedents, consequents, start, end, use_interval=
     Calculate the confidence for the given list of antecedents and consequents within the specified time range or interval range.
 
     Args:
-        df (pd.DataFrame): The dataset containing the transactions.
+        df (pd.DataFrame or TransactionCache): The dataset containing the transactions.
         antecedents (list): A list of dictionaries defining the antecedent conditions.
         consequents (list): A list of dictionaries defining the consequent conditions.
         start (int or datetime): The start of the interval (if use_interval is True) or timestamp range.
@@ -64,90 +40,324 @@ def calculate_confidence(df, antecedents, consequents, start, end, use_interval=
         float: The confidence value, which is the ratio of rows matching both antecedents and consequents
         to the rows matching antecedents. If no antecedent-matching rows exist, returns 0.
     """
-    if use_interval:
-        df_filtered = df[(df['interval'] >= start) & (df['interval'] <= end)]
-    else:
-        df_filtered = df[(df['timestamp'] >= start) & (df['timestamp'] <= end)]
-
-    filtered = len(df_filtered)
-
-    # Apply each antecedent condition
-    for antecedent in antecedents:
-        if antecedent['type'] == 'Categorical':
-            df_filtered = df_filtered[df_filtered[antecedent['feature']] == antecedent['category']]
-        elif antecedent['type'] == 'Numerical':
-            if 'border1' in antecedent and 'border2' in antecedent:
-                df_filtered = df_filtered[
-                    (df_filtered[antecedent['feature']] >= antecedent['border1']) &
-                    (df_filtered[antecedent['feature']] <= antecedent['border2'])
-                ]
+    return calculate_support_confidence(df, antecedents, consequents, start, end, use_interval)[1]
+
+
+def calculate_support_confidence(df, antecedents, consequents, start=0, end=0, use_interval=False):
+    """
+    Calculate both support and confidence for the given list of antecedents and consequents in a single pass.
+
+    The time range, antecedent and consequent conditions are each applied only once: the antecedent mask is
+    counted before the consequent conditions narrow it further.
+
+    Args:
+        df (pd.DataFrame or TransactionCache): The dataset containing the transactions.
+        antecedents (list): A list of dictionaries defining the antecedent conditions.
+        consequents (list): A list of dictionaries defining the consequent conditions.
+        start (int or datetime): The start of the interval (if use_interval is True) or timestamp range.
+        end (int or datetime): The end of the interval (if use_interval is True) or timestamp range.
+        use_interval (bool): Whether to filter by 'interval' (True) or 'timestamp' (False) for time-based filtering.
+
+    Returns:
+        tuple[float, float]: The support and confidence values. Each is 0 if its denominator is empty.
+    """
+    time_col = 'interval' if use_interval else 'timestamp'
+
+    # A single calculation on a data frame does not pay off the cost of caching all of its columns
+    if not isinstance(df, TransactionCache):
+        return _frame_support_confidence(df, antecedents, consequents, start, end, time_col)
+
+    cache = as_transaction_cache(df, time_col)
+
+    window = cache.get_time_window(start, end)
+    filtered = window.stop - window.start
+
+    # Count the rows matching the antecedents, and the rows matching both antecedents and consequents
+    antecedent_count, consequent_count = count_matches(
+        cache.numerical, cache.categorical, window,
+        compile_conditions(cache, antecedents), compile_conditions(cache, consequents)
+    )
+
+    support = consequent_count / filtered if filtered > 0 else 0.0
+    confidence = consequent_count / antecedent_count if antecedent_count > 0 else 0.0
+    return support, confidence
+
+
+def _frame_support_confidence(df, antecedents, consequents, start, end, time_col):
+    """
+    Calculate support and confidence (see calculate_support_confidence) directly on a data frame.
+
+    Only the time column and the columns used by the conditions are read, each as a raw NumPy array,
+    and the indices of the matching rows are narrowed condition by condition.
+    """
+    time_key = df[time_col].to_numpy()
+    if time_key.dtype.kind == 'M':
+        start = pd.Timestamp(start).to_datetime64()
+        end = pd.Timestamp(end).to_datetime64()
+
+    rows = np.flatnonzero((time_key >= start) & (time_key <= end))
+    filtered = len(rows)
+
+    rows = _narrow_rows(df, rows, antecedents)
+    antecedent_count = len(rows)
+
+    rows = _narrow_rows(df, rows, consequents)
+    consequent_count = len(rows)
+
+    support = consequent_count / filtered if filtered > 0 else 0.0
+    confidence = consequent_count / antecedent_count if antecedent_count > 0 else 0.0
+    return support, confidence
+
+
+def _narrow_rows(df, rows, conditions):
+    """
+    Keep the indices of the rows of a data frame which match all given conditions.
+    """
+    for condition in conditions:
+        if condition['type'] == 'Categorical':
+            rows = rows[df[condition['feature']].to_numpy()[rows] == condition['category']]
+        elif condition['type'] == 'Numerical':
+            if 'border1' in condition and 'border2' in condition:
+                values = df[condition['feature']].to_numpy()[rows]
+                rows = rows[(values >= condition['border1']) & (values <= condition['border2'])]
             else:
-                raise ValueError("Numerical antecedent must have 'border1' and 'border2'")
-
-    antecedent_support = df_filtered.copy()
-
-    # Apply consequent conditions to the antecedent-supporting rows
-    for consequent in consequents:
-        if consequent['type'] == 'Categorical':
-            antecedent_support = antecedent_support[antecedent_support[consequent['feature']] == consequent['category']]
-        elif consequent['type'] == 'Numerical':
-            if 'border1' in consequent and 'border2' in consequent:
-                antecedent_support = antecedent_support[
-                    (antecedent_support[consequent['feature']] >= consequent['border1']) &
-                    (antecedent_support[consequent['feature']] <= consequent['border2'])
-                ]
+                raise ValueError("Numerical condition must have 'border1' and 'border2'")
+    return rows
+
+
+def compile_conditions(cache, conditions):
+    """
+    Compile a list of rule conditions into parallel arrays over the cached feature matrices.
+
+    Args:
+        cache (TransactionCache): The cached transaction columns.
+        conditions (list): A list of dictionaries defining the conditions.
+
+    Returns:
+        tuple: Rows of the numerical conditions in the numerical matrix, their lower and upper borders,
+        rows of the categorical conditions in the categorical matrix and their category codes.
+    """
+    num_rows, num_low, num_high = [], [], []
+    cat_rows, cat_codes = [], []
+
+    for condition in conditions:
+        if condition['type'] == 'Categorical':
+            code = cache.get_category_code(condition['feature'], condition['category'])
+            cat_rows.append(cache.categorical_index[condition['feature']])
+            cat_codes.append(-1 if code is None else code)  # -1 never occurs as a code
+        elif condition['type'] == 'Numerical':
+            if 'border1' in condition and 'border2' in condition:
+                num_rows.append(cache.numerical_index[condition['feature']])
+                num_low.append(condition['border1'])
+                num_high.append(condition['border2'])
             else:
-                raise ValueError("Numerical consequent must have 'border1' and 'border2'")
+                raise ValueError("Numerical condition must have 'border1' and 'border2'")
+
+    return (
+        np.array(num_rows, dtype=np.int64),
+        np.array(num_low, dtype=cache.numerical.dtype),
+        np.array(num_high, dtype=cache.numerical.dtype),
+        np.array(cat_rows, dtype=np.int64),
+        np.array(cat_codes, dtype=np.int64)
+    )
 
-    antecedent_count = len(df_filtered)
-    consequent_count = len(antecedent_support)
 
-    # Calculate confidence: the ratio of rows that match both antecedents and consequents to the rows matching antecedents
-    return consequent_count / antecedent_count if antecedent_count > 0 else 0.0
+def conditions_key(cache, conditions):
+    """
+    Build a hashable key for a list of rule conditions, used to memoize metric calculations.
 
+    Numerical borders are binned to integers (see BORDER_SCALE), so that equal rules always produce
+    equal keys regardless of floating point noise.
 
-def calculate_inclusion_metric(features, antecedents, consequents):
+    Args:
+        cache (TransactionCache): The cached transaction columns.
+        conditions (list): A list of dictionaries defining the conditions.
+
+    Returns:
+        tuple: One (row, 'n', border1, border2) or (row, 'c', code) tuple per condition.
     """
-    Calculate the inclusion metric, which measures how many attributes appear in both the antecedent and consequent
-    relative to the total number of features in the dataset.
+    key = []
+    for condition in conditions:
+        if condition['type'] == 'Categorical':
+            code = cache.get_category_code(condition['feature'], condition['category'])
+            key.append((cache.categorical_index[condition['feature']], 'c', -1 if code is None else code))
+        elif condition['type'] == 'Numerical':
+            key.append((
+                cache.numerical_index[condition['feature']], 'n',
+                int(round(condition['border1'] * BORDER_SCALE)), int(round(condition['border2'] * BORDER_SCALE))
+            ))
+    return tuple(key)
+
+
+def bind_features(cache, features):
+    """
+    Map features, by their index in the feature metadata, to rows of the cached feature matrices.
 
     Args:
+        cache (TransactionCache): The cached transaction columns.
         features (dict): A dictionary of feature metadata for the dataset.
-        antecedents (list): A list of dictionaries defining the antecedent conditions.
-        consequents (list): A list of dictionaries defining the consequent conditions.
 
     Returns:
-        float: The inclusion metric value, normalized between 0 and 1.
+        tuple[list, list]: The matrix row of every feature (-1 if the feature is not cached), and for every
+        categorical feature the cached code of each of its categories (None for other features).
     """
-    all_dataset_features = len(features)
-    antecedent_features = {feature['feature'] for feature in antecedents}
-    consequent_features = {feature['feature'] for feature in consequents}
+    rows = []
+    category_codes = []
+
+    for feature_name, feature_meta in features.items():
+        if feature_meta['type'] == 'Categorical':
+            codes = [cache.get_category_code(feature_name, category) for category in feature_meta['categories']]
+            rows.append(cache.categorical_index[feature_name])
+            category_codes.append([-1 if code is None else code for code in codes])
+        else:
+            rows.append(cache.numerical_index.get(feature_name, -1))
+            category_codes.append(None)
+
+    return rows, category_codes
 
-    common_features = len(consequent_features) + len(antecedent_features)
 
-    if common_features == 0:
+def rule_conditions_key(bindings, rule):
+    """
+    Build the conditions key (see conditions_key) of a rule array.
+
+    Args:
+        bindings (tuple): The feature bindings returned by bind_features.
+        rule (np.ndarray): The attributes of the rule (see rule.RULE_DTYPE).
+
+    Returns:
+        tuple: The conditions key.
+    """
+    rows, category_codes = bindings
+    key = []
+    for feature, feature_type, border1, border2, category in zip(
+        rule['feature'].tolist(), rule['type'].tolist(), rule['border1'].tolist(), rule['border2'].tolist(),
+        rule['category'].tolist()
+    ):
+        if feature_type == CATEGORICAL:
+            key.append((rows[feature], 'c', category_codes[feature][category]))
+        elif feature_type == NUMERICAL:
+            key.append((rows[feature], 'n', round(border1 * BORDER_SCALE), round(border2 * BORDER_SCALE)))
+    return tuple(key)
+
+
+def compile_conditions_key(cache, key):
+    """
+    Compile a key built by conditions_key into parallel arrays over the cached feature matrices.
+
+    Args:
+        cache (TransactionCache): The cached transaction columns.
+        key (tuple): The conditions key.
+
+    Returns:
+        tuple: The compiled conditions, in the same form as returned by compile_conditions.
+    """
+    numerical = [part for part in key if part[1] == 'n']
+    categorical = [part for part in key if part[1] == 'c']
+
+    return (
+        np.array([part[0] for part in numerical], dtype=np.int64),
+        np.array([part[2] / BORDER_SCALE for part in numerical], dtype=cache.numerical.dtype),
+        np.array([part[3] / BORDER_SCALE for part in numerical], dtype=cache.numerical.dtype),
+        np.array([part[0] for part in categorical], dtype=np.int64),
+        np.array([part[2] for part in categorical], dtype=np.int64)
+    )
+
+
+def calculate_support_confidence_by_key(cache, antecedent_key, consequent_key, start, end, min_support=0.0):
+    """
+    Calculate both support and confidence for antecedents and consequents given as conditions keys.
+    Rules with a support below min_support are rejected early, without evaluating all their conditions.
+
+    Args:
+        cache (TransactionCache): The cached transaction columns.
+        antecedent_key (tuple): The key of the antecedent conditions.
+        consequent_key (tuple): The key of the consequent conditions.
+        start (int or datetime): The start of the time range in the cache's time column.
+        end (int or datetime): The end of the time range in the cache's time column.
+        min_support (float): Optional, the minimum support of a rule.
+
+    Returns:
+        tuple[float, float]: The support and confidence values. Each is 0 if its denominator is empty,
+        and both are 0 if the support is below min_support.
+    """
+    window = cache.get_time_window(start, end)
+    filtered = window.stop - window.start
+
+    antecedent_count, consequent_count = count_matches(
+        cache.numerical, cache.categorical, window,
+        compile_conditions_key(cache, antecedent_key), compile_conditions_key(cache, consequent_key),
+        min_count=int(min_support * filtered)
+    )
+
+    support = consequent_count / filtered if filtered > 0 else 0.0
+    if support < min_support:
+        return 0.0, 0.0
+
+    confidence = consequent_count / antecedent_count if antecedent_count > 0 else 0.0
+    return support, confidence
+
+
+def calculate_inclusion_metric(features, antecedents, consequents):
+    """
+    Calculate the inclusion metric, which measures how many features appear in the rule (in its antecedent or
+    consequent) relative to the total number of features in the dataset.
+
+    Args:
+        features (dict or FeatureTable): A dictionary of feature metadata for the dataset, or the feature
+            descriptor table if the antecedents and consequents are rule arrays.
+        antecedents (list or np.ndarray): A list of dictionaries defining the antecedent conditions.
+        consequents (list or np.ndarray): A list of dictionaries defining the consequent conditions.
+
+    Returns:
+        float: The inclusion metric value, normalized between 0 and 1.
+    """
+    if isinstance(features, FeatureTable):
+        all_dataset_features = len(features.types)
+        # Features of rule arrays are sets of bits, so the union is a bitwise OR
+        rule_features = (_feature_mask(antecedents) | _feature_mask(consequents)).bit_count()
+    else:
+        all_dataset_features = len(features)
+        antecedent_features = {feature['feature'] for feature in antecedents}
+        consequent_features = {feature['feature'] for feature in consequents}
+        rule_features = len(antecedent_features | consequent_features)
+
+    if rule_features == 0:
         return 0.0
 
     # Calculate inclusion metric normalized by total features
-    inclusion_metric = common_features / all_dataset_features
+    inclusion_metric = rule_features / all_dataset_features
 
     return inclusion_metric
 
 
+def _feature_mask(rule):
+    """
+    Get the features of a rule array as an integer with one bit set per feature index.
+    """
+    mask = 0
+    for feature in rule['feature'].tolist():
+        mask |= 1 << feature
+    return mask
+
+
 def calculate_amplitude_metric(features, antecedents, consequents):
     """
     Calculate the amplitude metric for the given rule, based on the ranges of numerical attributes in the antecedents
     and consequents. The amplitude metric rewards smaller ranges, indicating tighter intervals for numerical conditions.
 
     Args:
-        features (dict): A dictionary of feature metadata for the dataset.
-        antecedents (list): A list of dictionaries defining the antecedent conditions.
-        consequents (list): A list of dictionaries defining the consequent conditions.
+        features (dict or FeatureTable): A dictionary of feature metadata for the dataset, or the feature
+            descriptor table if the antecedents and consequents are rule arrays.
+        antecedents (list or np.ndarray): A list of dictionaries defining the antecedent conditions.
+        consequents (list or np.ndarray): A list of dictionaries defining the consequent conditions.
 
     Returns:
         float: The amplitude metric value, normalized between 0 and 1. A higher value indicates tighter numerical ranges
         in the antecedents and consequents.
     """
+    if isinstance(features, FeatureTable):
+        return _amplitude_metric_array(features, antecedents, consequents)
+
     total_range = 0.0
     num_numerical_attributes = 0
 
@@ -182,6 +392,29 @@ def calculate_amplitude_metric(features, antecedents, consequents):
     return amplitude_metric
 
 
+def _amplitude_metric_array(table, antecedents, consequents):
+    """
+    Calculate the amplitude metric (see calculate_amplitude_metric) of a rule given as rule arrays, with the
+    normalized ranges of all numerical attributes computed at once from the feature descriptor table.
+    """
+    rule_parts = np.concatenate((antecedents, consequents))
+    numerical = rule_parts[rule_parts['type'] == NUMERICAL]
+
+    # If there are no numerical attributes, return 0
+    if len(numerical) == 0:
+        return 0.0
+
+    feature_range = table.maximums[numerical['feature']] - table.minimums[numerical['feature']]
+
+    # If there is no variation in the feature, its normalized range is 0
+    normalized_range = np.divide(
+        numerical['border2'] - numerical['border1'], feature_range,
+        out=np.zeros(len(numerical)), where=feature_range != 0
+    )
+
+    return 1 - float(normalized_range.mean())
+
+
 def calculate_fitness(supp, conf, incl, alpha=1.0, beta=1.0, delta=1.0):
     """
     Calculate the fitness score of a rule using the weighted sum of support, confidence, and inclusion.
@@ -0,0 +1,127 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from niapy.algorithms.basic import ParticleSwarmAlgorithm
+
+# Problem evaluated by the current worker process, set once by the pool initializer
+_worker_problem = None
+
+
+def _init_worker(problem):
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _evaluate_worker(solution):
+    return _worker_problem.evaluate_rule(solution)
+
+
+def _check_initialization(kwargs):
+    if 'initialization_function' in kwargs:
+        raise ValueError('ParallelParticleSwarmAlgorithm initializes and evaluates the swarm itself, '
+                         'a custom initialization_function is not supported.')
+
+
+class ParallelParticleSwarmAlgorithm(ParticleSwarmAlgorithm):
+    def __init__(self, *args, n_jobs=None, **kwargs):
+        """
+        Initialize instance of ParallelParticleSwarmAlgorithm.
+
+        Particle Swarm Optimization which evaluates the whole swarm at once in a pool of worker processes.
+        All particles are moved using the global best of the previous iteration (synchronous PSO) and
+        their rules are then evaluated in parallel. The results are handed over to the NiaARMTS problem,
+        so that NiaPy's task bookkeeping and the rule archive are kept in the main process.
+
+        Unlike ParticleSwarmAlgorithm, which updates the global best after every particle, the update is
+        synchronous regardless of n_jobs, so the search converges differently and finds different rules
+        for the same seed. The swarm is always initialized uniformly at random.
+
+        Arguments:
+            n_jobs (int): Number of worker processes. Defaults to the number of CPUs, 1 evaluates in-process.
+            args, kwargs: Arguments of ParticleSwarmAlgorithm, except initialization_function.
+
+        Raises:
+            ValueError: An initialization_function is given.
+        """
+        _check_initialization(kwargs)
+        super().__init__(*args, **kwargs)
+        self.n_jobs = n_jobs if n_jobs is not None else os.cpu_count()
+        self.initialization_function = self.init_swarm
+        self.executor = None
+
+    def set_parameters(self, n_jobs=None, **kwargs):
+        _check_initialization(kwargs)
+        super().set_parameters(**kwargs)
+        self.n_jobs = n_jobs if n_jobs is not None else os.cpu_count()
+        self.initialization_function = self.init_swarm
+
+    def get_parameters(self):
+        params = super().get_parameters()
+        params.update({'n_jobs': self.n_jobs})
+        return params
+
+    def run(self, task):
+        """
+        Start the optimization with a pool of worker processes, each holding a copy of the problem.
+        """
+        if self.n_jobs <= 1:
+            return super().run(task)
+
+        with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker, initargs=(task.problem,)) as executor:
+            self.executor = executor
+            try:
+                return super().run(task)
+            finally:
+                self.executor = None
+
+    def evaluate_swarm(self, task, pop):
+        """
+        Evaluate the rules of all particles in parallel and queue the results on the problem.
+        The fitness values are then obtained through task.eval, which picks up the queued results.
+        """
+        if self.executor is None:
+            return
+
+        chunksize = max(1, len(pop) // self.n_jobs)
+        for solution, evaluation in zip(pop, self.executor.map(_evaluate_worker, pop, chunksize=chunksize)):
+            task.problem.pending_evaluations[solution.tobytes()] = evaluation
+
+    def init_swarm(self, task, population_size, rng, **_kwargs):
+        """
+        Initialize a uniformly random swarm and evaluate it in parallel.
+        """
+        pop = rng.uniform(task.lower, task.upper, (population_size, task.dimension))
+        self.evaluate_swarm(task, pop)
+        fpop = np.apply_along_axis(task.eval, 1, pop)
+        task.problem.pending_evaluations.clear()
+        return pop, fpop
+
+    def run_iteration(self, task, pop, fpop, xb, fxb, **params):
+        """
+        Move all particles, evaluate the swarm in parallel and update personal and global bests.
+        """
+        personal_best = params.pop('personal_best')
+        personal_best_fitness = params.pop('personal_best_fitness')
+        w = params.pop('w')
+        min_velocity = params.pop('min_velocity')
+        max_velocity = params.pop('max_velocity')
+        v = params.pop('v')
+
+        for i in range(len(pop)):
+            v[i] = self.update_velocity(v[i], pop[i], personal_best[i], xb, w, min_velocity, max_velocity, task)
+            pop[i] = task.repair(pop[i] + v[i], rng=self.rng)
+
+        self.evaluate_swarm(task, pop)
+
+        for i in range(len(pop)):
+            fpop[i] = task.eval(pop[i])
+            if fpop[i] < personal_best_fitness[i]:
+                personal_best[i], personal_best_fitness[i] = pop[i].copy(), fpop[i]
+            if fpop[i] < fxb:
+                xb, fxb = pop[i].copy(), fpop[i]
+
+        # Drop results of particles which were not evaluated because the task has stopped
+        task.problem.pending_evaluations.clear()
+
+        return pop, fpop, xb, fxb, {'personal_best': personal_best, 'personal_best_fitness': personal_best_fitness,
+                                    'w': w, 'min_velocity': min_velocity, 'max_velocity': max_velocity, 'v': v}
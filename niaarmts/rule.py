@@ -1,6 +1,20 @@
 import numpy as np
-
-def build_rule(solution, features, is_time_series=False):
+from collections import namedtuple
+from niaarmts.kernels import NUMERICAL, CATEGORICAL, UNKNOWN, decode_rule
+
+FeatureTable = namedtuple('FeatureTable', 'types minimums maximums n_categories vector_positions threshold_positions')
+FeatureMeta = namedtuple('FeatureMeta', 'name type min max categories n_categories vector_position threshold_position')
+
+# Attributes of a rule array: feature index, feature type, borders and selected category index (-1 if numerical)
+RULE_DTYPE = np.dtype([
+    ('feature', np.int32),
+    ('type', np.int8),
+    ('border1', np.float64),
+    ('border2', np.float64),
+    ('category', np.int32)
+])
+
+def build_rule(solution, features, is_time_series=False, table=None):
     """
     Build association rules based on a given solution and feature metadata.
 
@@ -8,13 +22,11 @@ def build_rule(solution, features, is_time_series=False):
         solution (list[float]): The solution array containing encoded thresholds, permutations and feature values.
         features (dict): A dictionary where keys are feature names, and values contain metadata about the feature.
         is_time_series (bool): Whether the dataset contains time series data.
+        table (FeatureTable): Optional, the descriptor table of the features, built with feature_table if not given.
 
     Returns:
         list: A list of rules constructed from the solution and features.
     """
-    is_first_attribute = True
-    attributes = []
-
     # Extract the number of features and the permutation part of the solution
     num_features = len(features)
     len_solution = len(solution)
@@ -23,55 +35,125 @@ def build_rule(solution, features, is_time_series=False):
     if len_solution < num_features:
         raise ValueError("Solution length is smaller than the number of features.")
 
-    # Separate the permutation part
-    permutation_part = solution[-num_features:]
-    solution_part = solution[:-num_features]
-
-    # Sort the permutation in descending order
-    permutation_indices = np.argsort(permutation_part)[::-1]
-
-    # Iterate over features based on the permutation order
-    for i in permutation_indices:
-        feature_name = list(features.keys())[i]
-        feature_meta = features[feature_name]
-        feature_type = feature_meta['type']
-
-        # Calculate the position of the vector from solution
-        vector_position = feature_position(features, feature_name)
-
-        # Determine threshold position based on feature type
-        threshold_position = vector_position + 2 if feature_type == "Numerical" else vector_position + 1
-
-        if solution_part[vector_position] > solution_part[threshold_position]:
-            # Handle numerical or time-series features
-            if feature_type != "Categorical":
-                border1 = np.round(calculate_border(feature_meta, solution_part[vector_position]), 4)
-                border2 = np.round(calculate_border(feature_meta, solution_part[vector_position + 1]), 4)
-
-                # Ensure correct border ordering
-                if border1 > border2:
-                    border1, border2 = border2, border1
-
-                # Add the numerical feature to the attribute list
-                if is_first_attribute:
-                    attributes = add_attribute([], feature_name, feature_type, border1, border2, "EMPTY")
-                    is_first_attribute = False
-                else:
-                    attributes = add_attribute(attributes, feature_name, feature_type, border1, border2, "EMPTY")
-            else:
-                # Handle categorical features
-                categories = feature_meta['categories']
-                selected_category = calculate_selected_category(solution_part[vector_position], len(categories))
-
-                # Add the categorical feature to the attribute list
-                if is_first_attribute:
-                    attributes = add_attribute([], feature_name, feature_type, 1.0, 1.0, categories[selected_category])
-                    is_first_attribute = False
-                else:
-                    attributes = add_attribute(attributes, feature_name, feature_type, 1.0, 1.0, categories[selected_category])
+    if table is None:
+        table = feature_table(features)
+
+    return rule_to_attributes(build_rule_array(solution, table), features)
+
+def build_rule_array(solution, table):
+    """
+    Build an association rule as a structured NumPy array (see RULE_DTYPE), based on a given solution.
+
+    Args:
+        solution (list[float]): The solution array containing encoded thresholds, permutations and feature values.
+        table (FeatureTable): The descriptor table of the features.
+
+    Returns:
+        np.ndarray: The attributes of the rule, in rule order.
+    """
+    # Decode the attributes of the rule (feature indices, borders and category indices)
+    indices, border1, border2, categories = decode_rule(np.asarray(solution, dtype=np.float64), *table)
+
+    rule = np.empty(len(indices), dtype=RULE_DTYPE)
+    rule['feature'] = indices
+    rule['type'] = table.types[indices]
+    rule['border1'] = border1
+    rule['border2'] = border2
+    rule['category'] = categories
+    return rule
+
+def rule_to_attributes(rule, features):
+    """
+    Convert a rule array into the list of attribute dictionaries used for the rule archive and output.
+
+    Args:
+        rule (np.ndarray): The attributes of the rule (see RULE_DTYPE).
+        features (dict or list[FeatureMeta]): A dictionary where keys are feature names, and values contain
+            metadata about the feature, or the metadata resolved with feature_metadata.
+
+    Returns:
+        list: A list of attribute dictionaries.
+    """
+    if isinstance(features, dict):
+        features = feature_metadata(features)
+
+    attributes = []
+    for i, border1, border2, category in zip(
+        rule['feature'].tolist(), rule['border1'].tolist(), rule['border2'].tolist(), rule['category'].tolist()
+    ):
+        feature_meta = features[i]
+
+        if category < 0:
+            # Add the numerical feature to the attribute list
+            add_attribute(attributes, feature_meta.name, feature_meta.type, border1, border2, "EMPTY")
+        else:
+            # Add the categorical feature to the attribute list
+            add_attribute(attributes, feature_meta.name, feature_meta.type, border1, border2, feature_meta.categories[category])
 
     return attributes
 
+def feature_metadata(features):
+    """
+    Resolve feature metadata into a list of FeatureMeta tuples, indexed by the position of the feature.
+
+    Args:
+        features (dict): A dictionary where keys are feature names, and values contain metadata about the feature.
+
+    Returns:
+        list[FeatureMeta]: The name, type, minimum, maximum, categories, number of categories, and vector and
+        threshold positions in the solution vector of every feature.
+    """
+    positions = feature_positions(features)
+    metadata = []
+
+    for feature_name, feature_meta in features.items():
+        categorical = feature_meta['type'] == 'Categorical'
+        position = positions[feature_name]
+        metadata.append(FeatureMeta(
+            feature_name,
+            feature_meta['type'],
+            feature_meta.get('min'),
+            feature_meta.get('max'),
+            feature_meta.get('categories'),
+            len(feature_meta['categories']) if categorical else 0,
+            position,
+            # Threshold follows the category, or both borders of numerical features
+            position + (1 if categorical else 2)
+        ))
+
+    return metadata
+
+def feature_table(features):
+    """
+    Flatten feature metadata into a descriptor table of NumPy arrays, used to decode rules.
+
+    Args:
+        features (dict or list[FeatureMeta]): A dictionary where keys are feature names, and values contain
+            metadata about the feature, or the metadata resolved with feature_metadata.
+
+    Returns:
+        FeatureTable: The feature types, minimums, maximums, numbers of categories, and vector and threshold
+        positions in the solution vector, one entry per feature.
+    """
+    if isinstance(features, dict):
+        features = feature_metadata(features)
+
+    types, minimums, maximums = [], [], []
+    for feature_meta in features:
+        numerical = feature_meta.type == 'Numerical'
+        types.append(CATEGORICAL if feature_meta.type == 'Categorical' else NUMERICAL if numerical else UNKNOWN)
+        minimums.append(feature_meta.min if numerical else 0.0)
+        maximums.append(feature_meta.max if numerical else 0.0)
+
+    return FeatureTable(
+        np.array(types, dtype=np.int8),
+        np.array(minimums, dtype=np.float64),
+        np.array(maximums, dtype=np.float64),
+        np.array([feature_meta.n_categories for feature_meta in features], dtype=np.int64),
+        np.array([feature_meta.vector_position for feature_meta in features], dtype=np.int64),
+        np.array([feature_meta.threshold_position for feature_meta in features], dtype=np.int64)
+    )
+
 def feature_position(features, feature_name):
     """
     Find the position of a feature in the solution vector based on its type.
@@ -90,6 +172,23 @@ def feature_position(features, feature_name):
         position += 2 if feat_meta['type'] == 'Categorical' else 3
     return position
 
+def feature_positions(features):
+    """
+    Find the positions of all features in the solution vector based on their types.
+    Args:
+        features (dict): The dictionary containing metadata about the features.
+
+    Returns:
+        dict: A dictionary mapping each feature name to its position in the solution vector.
+    """
+    positions = {}
+    position = 0
+    for feat_name, feat_meta in features.items():
+        positions[feat_name] = position
+        # Categorical features take 2 slots, others take 3
+        position += 2 if feat_meta['type'] == 'Categorical' else 3
+    return positions
+
 def calculate_border(feature_meta, value):
     """
     Calculate the border (threshold) value for a numerical or time series feature.
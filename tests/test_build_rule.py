@@ -2,7 +2,7 @@ import unittest
 import os
 import numpy as np
 from niaarmts import Dataset
-from niaarmts.rule import build_rule, calculate_border, calculate_selected_category, feature_position
+from niaarmts.rule import build_rule, build_rule_array, rule_to_attributes, feature_metadata, calculate_border, calculate_selected_category, feature_position, feature_positions, feature_table
 import pytest
 
 class TestBuildRule(unittest.TestCase):
@@ -48,6 +48,9 @@ class TestBuildRule(unittest.TestCase):
         # Check the length of the rule
         self.assertEqual(len(rule), 4)
 
+        # NumPy solutions (as passed by NiaPy) must decode to the same rule
+        self.assertEqual(build_rule(np.array(solution), features), rule)
+
         # Detailed check
         self.assertEqual(rule[0]['feature'], 'humidity')
         self.assertEqual(rule[0]['type'], 'Numerical')
@@ -89,6 +92,51 @@ class TestBuildRule(unittest.TestCase):
             0.93014498, 0.46848055, 0.15840165, 0.14308865, 0.86379166]
         self.assertEqual(solution_part, sol)
 
+        # check positions of features in the solution vector
+        positions = feature_positions(features)
+        self.assertEqual(positions, {'temperature': 0, 'humidity': 3, 'moisture': 6, 'light': 9, 'weather': 12})
+        for feature_name in features:
+            self.assertEqual(positions[feature_name], feature_position(features, feature_name))
+
+        # check the feature descriptor table
+        table = feature_table(features)
+        np.testing.assert_array_equal(table.types, [0, 0, 0, 0, 1])
+        np.testing.assert_array_equal(table.n_categories, [0, 0, 0, 0, 3])
+        np.testing.assert_array_equal(table.vector_positions, [0, 3, 6, 9, 12])
+        np.testing.assert_array_equal(table.threshold_positions, [2, 5, 8, 11, 13])
+        self.assertEqual(table.minimums[0], features['temperature']['min'])
+        self.assertEqual(table.maximums[0], features['temperature']['max'])
+        self.assertEqual(build_rule(solution, features, table=table), rule)
+
+        # check the rule array and its conversion to attribute dictionaries
+        rule_array = build_rule_array(solution, table)
+        np.testing.assert_array_equal(rule_array['feature'], [1, 4, 0, 3])
+        np.testing.assert_array_equal(rule_array['type'], [0, 1, 0, 0])
+        np.testing.assert_array_equal(rule_array['category'], [-1, 1, -1, -1])
+        np.testing.assert_array_equal(rule_array['border1'], [62.5865, 1.0, 29.0172, 9.6287])
+        np.testing.assert_array_equal(rule_array['border2'], [65.8921, 1.0, 29.4114, 12.864])
+        self.assertEqual(rule_to_attributes(rule_array, features), rule)
+
+        # check the resolved feature metadata
+        metadata = feature_metadata(features)
+        self.assertEqual([feature_meta.name for feature_meta in metadata], list(features))
+        self.assertEqual(metadata[4].type, 'Categorical')
+        self.assertEqual(metadata[4].n_categories, 3)
+        self.assertEqual((metadata[1].vector_position, metadata[1].threshold_position), (3, 5))
+        self.assertEqual(rule_to_attributes(rule_array, metadata), rule)
+
+
+    def test_large_valued_feature(self):
+        # e.g. timestamps in epoch nanoseconds, whose borders times 10^4 do not fit into int64
+        features = {'epoch': {'type': 'Numerical', 'min': 1.6e18, 'max': 1.7e18, 'categories': None}}
+        solution = [0.9, 0.95, 0.1, 0.5]
+
+        rule = build_rule(solution, features)
+        self.assertEqual(len(rule), 1)
+        self.assertEqual(rule[0]['border1'], np.round(1.6e18 + 1e17 * 0.9, 4))
+        self.assertEqual(rule[0]['border2'], np.round(1.6e18 + 1e17 * 0.95, 4))
+        self.assertAlmostEqual(rule[0]['border1'], 1.69e18, delta=1e3)
+
 
 
 # TODOS - check border calculations
@@ -0,0 +1,115 @@
+import unittest
+import numpy as np
+import pandas as pd
+from niaarmts.cache import TransactionCache, as_transaction_cache
+from niaarmts.metrics import calculate_support, calculate_confidence, calculate_support_confidence
+
+class TestTransactionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'num_col': [1.5, 2.3, 3.8, 2.0],
+            'cat_col': ['A', 'B', 'A', 'A'],
+            'interval': [1, 1, 2, 2]
+        })
+
+    def test_columns_are_numpy_arrays(self):
+        cache = TransactionCache(self.data)
+        self.assertEqual(cache.length, 4)
+        self.assertIsInstance(cache.get_column('num_col'), np.ndarray)
+        np.testing.assert_array_equal(cache.get_column('interval'), [1, 1, 2, 2])
+
+    def test_numerical_matrix(self):
+        cache = TransactionCache(self.data)
+        self.assertEqual(cache.numerical.dtype, np.float64)
+        self.assertEqual(cache.numerical.shape, (1, 4))
+        self.assertTrue(cache.numerical.flags['C_CONTIGUOUS'])
+        self.assertEqual(cache.numerical_index, {'num_col': 0})
+        np.testing.assert_array_equal(cache.get_column('num_col'), [1.5, 2.3, 3.8, 2.0])
+
+        cache = TransactionCache(self.data, dtype=np.float32)
+        self.assertEqual(cache.numerical.dtype, np.float32)
+
+    def test_values_at_borders_keep_full_precision(self):
+        data = pd.DataFrame({
+            'x': [-1.3000000000000007, -1.2, 2077.70046, 16777217.0],
+            'y': [1.0, 1.0, 1.0, 1.0],
+            'interval': [1, 1, 1, 1]
+        })
+        con = [{'feature': 'y', 'type': 'Numerical', 'border1': 0.0, 'border2': 2.0, 'category': 'EMPTY'}]
+
+        # Values just outside a border must not match, even where float32 would round them onto it
+        for border1, border2, expected in [(-1.3, -1.0, 0.25), (2077.7005, 2077.7009, 0.0), (16777216.0, 16777216.5, 0.0)]:
+            ant = [{'feature': 'x', 'type': 'Numerical', 'border1': border1, 'border2': border2, 'category': 'EMPTY'}]
+            self.assertEqual(calculate_support(data, ant, con, 1, 1, use_interval=True), expected)
+
+    def test_categorical_columns_are_factorized(self):
+        cache = TransactionCache(self.data)
+        self.assertEqual(cache.get_column('cat_col').dtype, np.int8)
+        np.testing.assert_array_equal(cache.get_column('cat_col'), [0, 1, 0, 0])
+        self.assertEqual(cache.get_category_code('cat_col', 'B'), 1)
+        self.assertIsNone(cache.get_category_code('cat_col', 'C'))
+
+    def test_rows_are_sorted_by_time_column(self):
+        data = pd.DataFrame({
+            'num_col': [3.75, 1.5, 2.0, 2.25],
+            'interval': [2, 1, 2, 1]
+        })
+        cache = TransactionCache(data)
+        self.assertEqual(cache.time_col, 'interval')
+        np.testing.assert_array_equal(cache.get_column('interval'), [1, 1, 2, 2])
+        np.testing.assert_array_equal(cache.get_column('num_col'), [1.5, 2.25, 3.75, 2.0])
+
+    def test_get_time_window(self):
+        cache = TransactionCache(self.data)
+        self.assertEqual(cache.get_time_window(1, 1), slice(0, 2))
+        self.assertEqual(cache.get_time_window(2, 5), slice(2, 4))
+        self.assertEqual(cache.get_time_window(3, 4), slice(4, 4))
+        self.assertEqual(cache.get_time_window(2, 1), slice(2, 2))
+
+        timestamps = pd.DataFrame({'timestamp': pd.to_datetime(['2021-01-01', '2021-01-02', '2021-01-03'])})
+        cache = TransactionCache(timestamps)
+        self.assertEqual(cache.get_time_window(pd.Timestamp('2021-01-02'), pd.Timestamp('2021-01-03')), slice(1, 3))
+
+    def test_as_transaction_cache(self):
+        cache = TransactionCache(self.data)
+        self.assertIs(as_transaction_cache(cache), cache)
+        self.assertIsInstance(as_transaction_cache(self.data), TransactionCache)
+        with self.assertRaises(ValueError):
+            as_transaction_cache(cache, 'timestamp')
+
+    def test_metrics_match_data_frame(self):
+        cache = TransactionCache(self.data)
+        ant = [{'feature': 'cat_col', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'A'}]
+        con = [{'feature': 'num_col', 'type': 'Numerical', 'border1': 1.0, 'border2': 2.5, 'category': 'EMPTY'}]
+
+        self.assertEqual(calculate_support(cache, ant, con, 1, 2, use_interval=True), 0.5)
+        self.assertEqual(calculate_support(self.data, ant, con, 1, 2, use_interval=True), 0.5)
+        self.assertAlmostEqual(calculate_confidence(cache, ant, con, 1, 2, use_interval=True), 2 / 3)
+        self.assertAlmostEqual(calculate_confidence(self.data, ant, con, 1, 1, use_interval=True), 1.0)
+
+        missing = [{'feature': 'cat_col', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'C'}]
+        self.assertEqual(calculate_support(cache, missing, con, 1, 2, use_interval=True), 0.0)
+
+    def test_data_frame_path_matches_cache(self):
+        rng = np.random.default_rng(5)
+        values = rng.uniform(0.0, 10.0, 300)
+        values[::13] = np.nan
+        categories = rng.choice(['A', 'B', 'C'], 300).astype(object)
+        categories[::11] = None
+        data = pd.DataFrame({
+            'num_col': values,
+            'cat_col': categories,
+            'interval': rng.integers(0, 10, 300)
+        })
+        cache = TransactionCache(data)
+
+        for _ in range(20):
+            low, high = np.sort(rng.uniform(0.0, 10.0, 2))
+            start, end = np.sort(rng.integers(0, 10, 2))
+            ant = [{'feature': 'cat_col', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': rng.choice(['A', 'B', 'D'])}]
+            con = [{'feature': 'num_col', 'type': 'Numerical', 'border1': low, 'border2': high, 'category': 'EMPTY'}]
+            self.assertEqual(
+                calculate_support_confidence(data, ant, con, start, end, use_interval=True),
+                calculate_support_confidence(cache, ant, con, start, end, use_interval=True)
+            )
@@ -26,6 +26,35 @@ class TestDataset(unittest.TestCase):
         self.assertTrue('timestamp' in dataset.data.columns)
         self.assertTrue('col2' in dataset.data.columns)
 
+        # Feature metadata is computed once per loaded dataset, and every caller gets its own copy
+        features = dataset.get_all_features_with_metadata()
+        features['col1']['max'] = 100
+        del features['col2']
+        features = dataset.get_all_features_with_metadata()
+        self.assertEqual(features['col1']['max'], 3)
+        self.assertIn('col2', features)
+
+        mock_read_csv.return_value = mock_data.assign(col1=[4, 5, 6])
+        dataset.load_data_from_csv('mock_file.csv', timestamp_col='timestamp')
+        self.assertEqual(dataset.get_all_features_with_metadata()['col1']['max'], 6)
+
+        # Replacing the data frame directly also invalidates the metadata
+        dataset.data = dataset.data.drop(columns=['col2'])
+        self.assertEqual(list(dataset.get_all_features_with_metadata()), ['col1'])
+
+    @patch('pandas.read_csv')
+    def test_load_data_from_csv_with_engine(self, mock_read_csv):
+        mock_read_csv.return_value = pd.DataFrame({'col1': [1, 2, 3], 'col2': ['A', 'B', 'A']})
+
+        dataset = Dataset()
+        dataset.load_data_from_csv('mock_file.csv', engine='pyarrow')
+        mock_read_csv.assert_called_once_with('mock_file.csv', engine='pyarrow')
+
+        # The default parser is used unless an engine is requested
+        mock_read_csv.reset_mock()
+        dataset.load_data_from_csv('mock_file.csv')
+        mock_read_csv.assert_called_once_with('mock_file.csv')
+
     def test_get_feature_summary(self):
         dataset = Dataset()
         # Manually set data for testing
@@ -0,0 +1,143 @@
+import unittest
+import numpy as np
+import pandas as pd
+from niaarmts.cache import TransactionCache
+from niaarmts.kernels import NUMBA_AVAILABLE, NUMBA_MAX_ROWS, count_matches, _count_matches_numpy, _popcount, decode_rule, _decode_rule_python, _round_border
+from niaarmts.metrics import compile_conditions
+from niaarmts.rule import feature_table
+
+class TestKernels(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        values = rng.uniform(0.0, 10.0, 200)
+        values[::17] = np.nan
+        self.cache = TransactionCache(pd.DataFrame({
+            'num_col1': values,
+            'num_col2': rng.integers(0, 100, 200),
+            'cat_col': rng.choice(['A', 'B', 'C'], 200),
+            'interval': np.repeat(np.arange(10), 20)
+        }))
+        self.ant = compile_conditions(self.cache, [
+            {'feature': 'num_col1', 'type': 'Numerical', 'border1': 2.0, 'border2': 8.0, 'category': 'EMPTY'},
+            {'feature': 'cat_col', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'B'}
+        ])
+        self.con = compile_conditions(self.cache, [
+            {'feature': 'num_col2', 'type': 'Numerical', 'border1': 10, 'border2': 60, 'category': 'EMPTY'}
+        ])
+
+    def test_numpy_counts(self):
+        window = self.cache.get_time_window(2, 7)
+        antecedent_count, consequent_count = _count_matches_numpy(
+            self.cache.numerical, self.cache.categorical, window, self.ant, self.con
+        )
+
+        rows = slice(window.start, window.stop)
+        num1 = self.cache.get_column('num_col1')[rows]
+        num2 = self.cache.get_column('num_col2')[rows]
+        cat = self.cache.get_column('cat_col')[rows]
+        expected_ant = (num1 >= 2.0) & (num1 <= 8.0) & (cat == self.cache.get_category_code('cat_col', 'B'))
+        expected_con = expected_ant & (num2 >= 10) & (num2 <= 60)
+
+        self.assertEqual(antecedent_count, int(expected_ant.sum()))
+        self.assertEqual(consequent_count, int(expected_con.sum()))
+
+    def test_min_count(self):
+        window = self.cache.get_time_window(0, 9)
+        counts = count_matches(self.cache.numerical, self.cache.categorical, window, self.ant, self.con)
+        self.assertGreater(counts[1], 0)
+
+        for count in (count_matches, _count_matches_numpy):
+            # Rules reaching the minimum count are counted in full, the others are cut off
+            self.assertEqual(count(self.cache.numerical, self.cache.categorical, window, self.ant, self.con, counts[1]), counts)
+            self.assertEqual(count(self.cache.numerical, self.cache.categorical, window, self.ant, self.con, counts[1] + 1), (0, 0))
+
+    def test_popcount(self):
+        words = np.random.default_rng(3).integers(0, 2 ** 63, 50, dtype=np.uint64)
+        self.assertEqual(_popcount(words), sum(bin(int(word)).count('1') for word in words))
+        self.assertEqual(_popcount(np.zeros(0, dtype=np.uint64)), 0)
+
+    @unittest.skipUnless(NUMBA_AVAILABLE, 'Numba is not installed')
+    def test_numba_matches_numpy(self):
+        from niaarmts.kernels import _count_matches_numba
+
+        for start, end in [(0, 9), (2, 7), (3, 6), (5, 5), (7, 2)]:
+            window = self.cache.get_time_window(start, end)
+            expected = _count_matches_numpy(self.cache.numerical, self.cache.categorical, window, self.ant, self.con)
+            for min_count in (0, expected[1], expected[1] + 1):
+                self.assertEqual(
+                    _count_matches_numba(self.cache.numerical, self.cache.categorical, window.start, window.stop,
+                                         min_count, *self.ant, *self.con),
+                    _count_matches_numpy(self.cache.numerical, self.cache.categorical, window, self.ant, self.con, min_count)
+                )
+
+    def test_large_window(self):
+        rng = np.random.default_rng(5)
+        n = NUMBA_MAX_ROWS + 100
+        cache = TransactionCache(pd.DataFrame({
+            'num_col1': rng.uniform(0.0, 10.0, n),
+            'num_col2': rng.integers(0, 100, n),
+            'cat_col': rng.choice(['A', 'B', 'C'], n),
+            'interval': np.arange(n)
+        }))
+        ant = compile_conditions(cache, [
+            {'feature': 'num_col1', 'type': 'Numerical', 'border1': 2.0, 'border2': 8.0, 'category': 'EMPTY'},
+            {'feature': 'cat_col', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'B'}
+        ])
+        con = compile_conditions(cache, [
+            {'feature': 'num_col2', 'type': 'Numerical', 'border1': 10, 'border2': 60, 'category': 'EMPTY'}
+        ])
+        num1 = cache.get_column('num_col1')
+        num2 = cache.get_column('num_col2')
+        expected_ant = (num1 >= 2.0) & (num1 <= 8.0) & (cache.get_column('cat_col') == cache.get_category_code('cat_col', 'B'))
+        expected_con = expected_ant & (num2 >= 10) & (num2 <= 60)
+
+        # Both sides of the row threshold count the same
+        for window in (slice(0, n), slice(0, NUMBA_MAX_ROWS)):
+            self.assertEqual(
+                count_matches(cache.numerical, cache.categorical, window, ant, con),
+                (int(expected_ant[window].sum()), int(expected_con[window].sum()))
+            )
+
+    @unittest.skipUnless(NUMBA_AVAILABLE, 'Numba is not installed')
+    def test_decode_rule_matches_python(self):
+        features = {
+            'num_col1': {'type': 'Numerical', 'min': 0.0, 'max': 10.0, 'categories': None},
+            'cat_col': {'type': 'Categorical', 'min': None, 'max': None, 'categories': np.array(['A', 'B', 'C'], dtype=object)},
+            'num_col2': {'type': 'Numerical', 'min': -5, 'max': 95, 'categories': None}
+        }
+        table = feature_table(features)
+        rng = np.random.default_rng(7)
+
+        for i in range(20):
+            solution = rng.uniform(0.0, 1.0, 11)
+            if i % 4 == 0:
+                # Permutation values clamped to a bound tie
+                solution[-3:] = 1.0
+            decoded = decode_rule(solution, *table)
+            expected = _decode_rule_python(solution, *table)
+            for actual, reference in zip(decoded, expected):
+                np.testing.assert_array_equal(actual, reference)
+
+    def test_decode_rule_python(self):
+        features = {
+            'num_col1': {'type': 'Numerical', 'min': 0.0, 'max': 10.0, 'categories': None},
+            'cat_col': {'type': 'Categorical', 'min': None, 'max': None, 'categories': np.array(['A', 'B', 'C'], dtype=object)},
+            'num_col2': {'type': 'Numerical', 'min': -5, 'max': 95, 'categories': None}
+        }
+        table = feature_table(features)
+        # All features are selected and the permutation ties, so they are visited in reverse feature order
+        solution = np.array([0.6, 0.2, 0.1, 0.9, 0.0, 0.71234567, 0.3, 0.1, 0.5, 0.5, 0.5])
+        indices, border1, border2, categories = _decode_rule_python(solution, *table)
+
+        np.testing.assert_array_equal(indices, [2, 1, 0])
+        np.testing.assert_array_equal(border1, [np.round(-5 + 100 * 0.3, 4), 1.0, np.round(10 * 0.2, 4)])
+        np.testing.assert_array_equal(border2, [np.round(-5 + 100 * 0.71234567, 4), 1.0, np.round(10 * 0.6, 4)])
+        np.testing.assert_array_equal(categories, [-1, 1, -1])
+
+    def test_round_border(self):
+        values = [0.0, 1.23455, -1.23465, 2.5e-5, 123456.78905, 3.0e15 + 0.5, 1.0e20, -7.0e300, 1.0e305,
+                  np.inf, -np.inf, np.nan]
+        with np.errstate(over='ignore', invalid='ignore'):
+            expected = np.round(np.array(values), 4)
+        np.testing.assert_array_equal([_round_border(value) for value in values], expected)
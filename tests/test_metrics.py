@@ -1,10 +1,16 @@
 import unittest
 import os
+import sys
+import json
+import tempfile
+from unittest.mock import patch
 import pandas as pd
 import numpy as np
 from niaarmts import Dataset
 from niaarmts.NiaARMTS import NiaARMTS
-from niaarmts.metrics import calculate_support, calculate_confidence, calculate_inclusion_metric
+from niaarmts.cache import TransactionCache
+from niaarmts.rule import build_rule_array, feature_table
+from niaarmts.metrics import calculate_support, calculate_confidence, calculate_support_confidence, calculate_inclusion_metric, calculate_amplitude_metric, conditions_key, rule_conditions_key, bind_features, calculate_support_confidence_by_key
 
 class TestNiaARMTS(unittest.TestCase):
 
@@ -180,3 +186,165 @@ class TestNiaARMTS(unittest.TestCase):
 
         self.assertEqual(inclusion1, 0.4)
         self.assertEqual(inclusion2, 0.6)
+
+        # Features used in both the antecedent and the consequent are counted once
+        self.assertEqual(calculate_inclusion_metric(self.features, ant2, ant + con2), 0.6)
+
+    def test_calculate_support_confidence(self):
+        ant = [
+            {'feature': 'weather', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'clouds'},
+            {'feature': 'humidity', 'type': 'Numerical', 'border1': 60.23, 'border2': 65.8921, 'category': 'EMPTY'}
+        ]
+
+        con = [{'feature': 'temperature', 'type': 'Numerical', 'border1': 0, 'border2': 100, 'category': 'EMPTY'}]
+
+        min_interval, max_interval = self.niaarmts.map_to_ts(self.solution[-3], self.solution[-2])
+
+        start = self.niaarmts.transactions.loc[min_interval, 'timestamp']
+        end = self.niaarmts.transactions.loc[max_interval, 'timestamp']
+
+        # The fused calculation must agree with the separate metrics
+        support, confidence = calculate_support_confidence(self.niaarmts.transaction_cache, ant, con, start, end)
+
+        self.assertEqual(support, calculate_support(self.niaarmts.transactions, ant, con, start, end))
+        self.assertEqual(confidence, calculate_confidence(self.niaarmts.transactions, ant, con, start, end))
+        self.assertEqual(support, 0.3)
+        self.assertEqual(confidence, 1.0)
+
+    def test_calculate_support_confidence_by_key(self):
+        ant = [
+            {'feature': 'weather', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'clouds'},
+            {'feature': 'humidity', 'type': 'Numerical', 'border1': 60.23, 'border2': 65.8921, 'category': 'EMPTY'}
+        ]
+
+        con = [{'feature': 'light', 'type': 'Numerical', 'border1': 13.0, 'border2': 20.8921, 'category': 'EMPTY'}]
+
+        cache = self.niaarmts.transaction_cache
+        ant_key = conditions_key(cache, ant)
+        con_key = conditions_key(cache, con)
+
+        self.assertEqual(ant_key, ((0, 'c', 0), (1, 'n', 602300, 658921)))
+        self.assertEqual(con_key, ((3, 'n', 130000, 208921),))
+
+        start = self.niaarmts.transactions['timestamp'].iloc[13]
+        end = self.niaarmts.transactions['timestamp'].iloc[22]
+
+        self.assertEqual(
+            calculate_support_confidence_by_key(cache, ant_key, con_key, start, end),
+            calculate_support_confidence(cache, ant, con, start, end)
+        )
+
+    def test_rule_array_metrics(self):
+        rule = build_rule_array(self.solution, self.niaarmts.feature_table)
+        ant, con = rule[:2], rule[2:]
+
+        # Keys and metrics of rule arrays must agree with those of attribute dictionaries
+        cache = self.niaarmts.transaction_cache
+        self.assertEqual(rule_conditions_key(self.niaarmts.feature_bindings, ant), conditions_key(cache, self.ant))
+        self.assertEqual(rule_conditions_key(self.niaarmts.feature_bindings, con), conditions_key(cache, self.con))
+
+        table = self.niaarmts.feature_table
+        self.assertEqual(
+            calculate_inclusion_metric(table, ant, con),
+            calculate_inclusion_metric(self.features, self.ant, self.con)
+        )
+        self.assertEqual(calculate_inclusion_metric(table, ant, ant[1:]), 0.4)
+        self.assertEqual(calculate_inclusion_metric(table, ant[:0], con[:0]), 0.0)
+        self.assertAlmostEqual(
+            calculate_amplitude_metric(table, ant, con),
+            calculate_amplitude_metric(self.features, self.ant, self.con)
+        )
+
+        # Features without variation have a normalized range of 0
+        constant_table = table._replace(maximums=table.minimums)
+        self.assertEqual(calculate_amplitude_metric(constant_table, ant, con), 1.0)
+        self.assertEqual(calculate_amplitude_metric(table, ant[1:], ant[1:]), 0.0)
+
+    def test_min_support(self):
+        cache = self.niaarmts.transaction_cache
+        ant_key = conditions_key(cache, [{'feature': 'weather', 'type': 'Categorical', 'border1': 1.0, 'border2': 1.0, 'category': 'clouds'}])
+        con_key = conditions_key(cache, [{'feature': 'temperature', 'type': 'Numerical', 'border1': 0, 'border2': 100, 'category': 'EMPTY'}])
+        start = self.niaarmts.transactions['timestamp'].iloc[0]
+        end = self.niaarmts.transactions['timestamp'].iloc[-1]
+
+        support, confidence = calculate_support_confidence_by_key(cache, ant_key, con_key, start, end)
+        self.assertGreater(support, 0.0)
+        self.assertEqual(calculate_support_confidence_by_key(cache, ant_key, con_key, start, end, support), (support, confidence))
+        self.assertEqual(calculate_support_confidence_by_key(cache, ant_key, con_key, start, end, support + 0.01), (0.0, 0.0))
+
+        # Rules below the support floor get a fitness of 0
+        solution = np.array(self.solution)
+        fitness = self.niaarmts.evaluate(solution)
+        self.assertGreater(fitness, 0.0)
+        self.niaarmts.min_support = 1.0
+        self.assertEqual(self.niaarmts.evaluate_rule(solution), {'fitness': 0.0})
+
+        # Memoized results do not depend on a previous support floor
+        self.niaarmts.min_support = 0.0
+        self.assertEqual(self.niaarmts.evaluate_rule(solution)['fitness'], fitness)
+
+    def test_large_valued_feature_keys(self):
+        data = pd.DataFrame({
+            'epoch': [1.6e18, 1.69e18, 1.692e18, 1.7e18],
+            'light': [1.0, 2.0, 3.0, 4.0],
+            'interval': [1, 1, 1, 1]
+        })
+        features = {
+            'epoch': {'type': 'Numerical', 'min': 1.6e18, 'max': 1.7e18, 'categories': None},
+            'light': {'type': 'Numerical', 'min': 1.0, 'max': 4.0, 'categories': None}
+        }
+        cache = TransactionCache(data)
+        rule = build_rule_array([0.9, 0.95, 0.1, 0.1, 1.0, 0.0, 0.6, 0.5], feature_table(features))
+        ant, con = rule[:1], rule[1:]
+
+        ant_key = rule_conditions_key(bind_features(cache, features), ant)
+        # Bins of borders far above the int64 range still map back to the exact borders
+        row, _, bin1, bin2 = ant_key[0]
+        self.assertEqual(row, 0)
+        self.assertEqual((bin1 / 10 ** 4, bin2 / 10 ** 4), (ant['border1'][0], ant['border2'][0]))
+        self.assertAlmostEqual(ant['border1'][0], 1.69e18, delta=1e3)
+
+        attributes = [
+            {'feature': 'epoch', 'type': 'Numerical', 'border1': ant['border1'][0], 'border2': ant['border2'][0], 'category': 'EMPTY'},
+            {'feature': 'light', 'type': 'Numerical', 'border1': con['border1'][0], 'border2': con['border2'][0], 'category': 'EMPTY'}
+        ]
+        self.assertEqual(
+            calculate_support_confidence_by_key(cache, ant_key, rule_conditions_key(bind_features(cache, features), con), 1, 1),
+            calculate_support_confidence(cache, attributes[:1], attributes[1:], 1, 1, use_interval=True)
+        )
+        self.assertEqual(calculate_support_confidence(cache, attributes[:1], attributes[1:], 1, 1, use_interval=True), (0.5, 1.0))
+
+    def test_support_confidence_is_memoized(self):
+        self.niaarmts.support_confidence.cache_clear()
+        solution = np.array(self.solution)
+
+        fitness = self.niaarmts.evaluate(solution)
+        self.assertEqual(self.niaarmts.evaluate(solution), fitness)
+
+        info = self.niaarmts.support_confidence.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+
+    def test_save_rules(self):
+        self.niaarmts.evaluate(np.array(self.solution))
+        self.assertEqual(len(self.niaarmts.rule_archive), 1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, 'rules.csv')
+            self.niaarmts.save_rules_to_csv(csv_path)
+            rules = pd.read_csv(csv_path)
+            self.assertEqual(len(rules), 1)
+            self.assertAlmostEqual(rules['fitness'][0], self.niaarmts.rule_archive[0]['fitness'])
+
+            # Both the orjson and the standard json writer must produce the same document
+            json_path = os.path.join(tmp_dir, 'rules.json')
+            self.niaarmts.save_rules_to_json(json_path)
+            with open(json_path) as f:
+                saved = json.load(f)
+
+            with patch.object(sys.modules['niaarmts.NiaARMTS'], 'orjson', None):
+                self.niaarmts.save_rules_to_json(json_path)
+            with open(json_path) as f:
+                self.assertEqual(json.load(f), saved)
+
+            self.assertEqual(saved['rules'][0]['antecedent'], self.niaarmts.rule_archive[0]['antecedent'])
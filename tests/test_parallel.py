@@ -0,0 +1,77 @@
+import unittest
+import os
+import pickle
+import numpy as np
+from niapy.task import Task
+from niaarmts import Dataset
+from niaarmts.NiaARMTS import NiaARMTS
+from niaarmts.parallel import ParallelParticleSwarmAlgorithm
+
+class TestParallelParticleSwarmAlgorithm(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = Dataset()
+        self.dataset.load_data_from_csv(os.path.join(os.path.dirname(__file__), "test_data", "ts.csv"), timestamp_col='timestamp')
+
+    def create_problem(self):
+        return NiaARMTS(
+            dimension=self.dataset.calculate_problem_dimension(),
+            lower=0.0,
+            upper=1.0,
+            features=self.dataset.get_all_features_with_metadata(),
+            transactions=self.dataset.get_all_transactions(),
+            interval='false',
+            alpha=1.0,
+            beta=1.0,
+            gamma=1.0,
+            delta=1.0
+        )
+
+    def run_algorithm(self, n_jobs):
+        problem = self.create_problem()
+        task = Task(problem=problem, max_iters=5)
+        algorithm = ParallelParticleSwarmAlgorithm(population_size=10, seed=1, n_jobs=n_jobs)
+        best_x, best_fitness = algorithm.run(task)
+        return problem, task, best_x, best_fitness
+
+    def test_parallel_matches_in_process(self):
+        problem, task, best_x, best_fitness = self.run_algorithm(n_jobs=1)
+        parallel_problem, parallel_task, parallel_best_x, parallel_best_fitness = self.run_algorithm(n_jobs=2)
+
+        self.assertEqual(parallel_task.evals, task.evals)
+        self.assertEqual(parallel_best_fitness, best_fitness)
+        np.testing.assert_array_equal(parallel_best_x, best_x)
+
+        self.assertGreater(len(parallel_problem.rule_archive), 0)
+        self.assertEqual(
+            [(entry['full_rule'], entry['fitness']) for entry in parallel_problem.get_rule_archive()],
+            [(entry['full_rule'], entry['fitness']) for entry in problem.get_rule_archive()]
+        )
+        self.assertEqual(parallel_problem.pending_evaluations, {})
+
+    def test_custom_initialization_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ParallelParticleSwarmAlgorithm(population_size=10, initialization_function=lambda *args, **kwargs: None)
+
+        algorithm = ParallelParticleSwarmAlgorithm(population_size=10, n_jobs=1)
+        with self.assertRaises(ValueError):
+            algorithm.set_parameters(initialization_function=lambda *args, **kwargs: None)
+
+        algorithm.set_parameters(population_size=5, n_jobs=2)
+        self.assertEqual(algorithm.initialization_function, algorithm.init_swarm)
+        self.assertEqual(algorithm.get_parameters()['n_jobs'], 2)
+
+    def test_problem_is_picklable(self):
+        problem = self.create_problem()
+        solution = np.random.default_rng(1).uniform(0.0, 1.0, problem.dimension)
+
+        restored = pickle.loads(pickle.dumps(problem))
+        restored_evaluation = restored.evaluate_rule(solution)
+        evaluation = problem.evaluate_rule(solution)
+        self.assertEqual(restored_evaluation.keys(), evaluation.keys())
+        for key, value in evaluation.items():
+            if isinstance(value, np.ndarray):
+                np.testing.assert_array_equal(restored_evaluation[key], value)
+            else:
+                self.assertEqual(restored_evaluation[key], value)
+        self.assertEqual(restored.support_confidence.cache_info().currsize, 1)